@@ -1,7 +1,17 @@
 import asyncio
-import json
+import atexit
+import functools
+import logging
 import os
-
+import socket
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+import msgspec
+import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
@@ -12,6 +22,33 @@ from tools import scout_github_issues, analyze_issue_code
 
 load_dotenv()
 
+# "dev" turns on DEBUG logging, including a summary of every Gemini message (noisy: audio arrives
+# many times a second). Anything else runs the quiet production defaults.
+REPORECON_MODE = os.getenv("REPORECON_MODE", "prod")
+
+
+def configure_logging():
+    """Hand log records to a background thread so writing to stdout never blocks the event loop."""
+    logger = logging.getLogger("reporecon")
+    if logger.handlers:
+        return
+
+    records = SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(records, handler)
+
+    logger.addHandler(QueueHandler(records))
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG if REPORECON_MODE == "dev" else logging.INFO)
+
+    listener.start()
+    atexit.register(listener.stop)
+
+
+configure_logging()
+log = logging.getLogger("reporecon.ws")
+
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 app = FastAPI(title="RepoRecon Audio Bridge")
@@ -29,14 +66,53 @@ client = genai.Client(api_key=GEMINI_API_KEY)
 # CORRECTED: Must be the 2.0-flash model
 GEMINI_MODEL = "gemini-2.5-flash-native-audio-latest"
 
+# Gemini Live speaks 24 kHz 16-bit mono PCM (48 bytes per millisecond).
+# Queued chunks are merged into frames of at most ~100 ms so one slow send doesn't turn into a burst of tiny frames.
+AUDIO_BATCH_MAX_BYTES = 100 * 48
+
+# Microphone audio arrives in ~13 ms frames; buffer up to ~100 ms per session.send, and flush early
+# whenever the client goes quiet for a moment so the tail of an utterance isn't held back.
+INBOUND_AUDIO_FLUSH_BYTES = 100 * 48
+INBOUND_AUDIO_IDLE_FLUSH_SECONDS = 0.02
+
+# Chunks buffered between the Gemini reader and the client writer. When a slow client lets this fill up
+# the oldest chunk is dropped: stale live audio is worth less than keeping the Gemini reader moving.
+AUDIO_QUEUE_MAXSIZE = 32
+
+# Once the client socket is backed up, keep at most ~200 ms of queued audio and discard anything older
+AUDIO_HIGH_WATERMARK_BYTES = 200 * 48
+
+# Opt-in: merge coalesced chunks into one preallocated per-session buffer instead of a fresh bytes object.
+# Off by default since CPython's allocator is usually just as fast; enable only if profiling says otherwise.
+AUDIO_BUFFER_POOL = os.getenv("REPORECON_AUDIO_BUFFER_POOL") == "1"
+
+# Kernel socket buffers sized for ~48 KB/s of PCM rather than bulk transfer, so audio can't sit
+# for hundreds of milliseconds in a deep send queue. TCP_NOTSENT_LOWAT caps the unsent part on Linux.
+AUDIO_SOCKET_BUFFER_BYTES = 64 * 1024
+AUDIO_NOTSENT_LOWAT_BYTES = 16 * 1024
+
 AVAILABLE_TOOLS = {
     "scout_github_issues": scout_github_issues,
     "analyze_issue_code": analyze_issue_code,
 }
 
+# Tools do blocking GitHub I/O; a dedicated pool keeps them from starving the loop's default executor
+TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool")
+
+# Build the declarations once at import: handing the SDK raw callables makes it
+# re-introspect their signatures and docstrings on every live.connect()
+TOOL_DECLARATIONS = types.Tool(
+    function_declarations=[
+        types.FunctionDeclaration.from_callable_with_api_option(
+            callable=func, api_option="GEMINI_API", use_json_schema=True
+        )
+        for func in AVAILABLE_TOOLS.values()
+    ]
+)
+
 LIVE_CONFIG = types.LiveConnectConfig(
     response_modalities=[types.Modality.AUDIO], 
-    tools=[scout_github_issues, analyze_issue_code], # SDK handles execution automatically!
+    tools=[TOOL_DECLARATIONS], # Calls are still executed by send_to_client below
     system_instruction=types.Content(
         parts=[
             types.Part.from_text(
@@ -47,6 +123,64 @@ LIVE_CONFIG = types.LiveConnectConfig(
 )
 
 
+def tune_socket_for_audio(transport, label: str):
+    """Disable Nagle (and delayed ACKs on Linux) and keep kernel buffers small so audio frames go out immediately."""
+    sock = transport.get_extra_info("socket") if transport is not None else None
+    if sock is None:
+        log.info("[Socket] No raw socket available for %s; skipping TCP tuning", label)
+        return
+
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if hasattr(socket, "TCP_QUICKACK"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, AUDIO_SOCKET_BUFFER_BYTES)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, AUDIO_SOCKET_BUFFER_BYTES)
+        if hasattr(socket, "TCP_NOTSENT_LOWAT"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NOTSENT_LOWAT, AUDIO_NOTSENT_LOWAT_BYTES)
+    except OSError as e:
+        log.warning("[Socket] Failed to tune %s socket: %s", label, e)
+
+
+def client_transport(websocket: WebSocket):
+    transport = websocket.scope.get("transport")
+    if transport is None:
+        # uvicorn keeps the transport on the protocol object that owns the ASGI receive callable
+        protocol = getattr(websocket._receive, "__self__", None)
+        transport = getattr(protocol, "transport", None)
+    return transport
+
+
+def gemini_transport(session):
+    # The SDK does not expose its websocket publicly; fall back gracefully if that changes.
+    return getattr(getattr(session, "_ws", None), "transport", None)
+
+
+class SessionShutdown(Exception):
+    """Raised by a bridge task to end the session; the TaskGroup then cancels its siblings."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ControlMessage(msgspec.Struct):
+    """Text frame sent by the frontend, e.g. {"type": "end_turn"}."""
+
+    type: str
+
+
+class ToolExecutionEvent(msgspec.Struct, tag="tool_execution", tag_field="type"):
+    """Text frame telling the frontend which tool Gemini just called."""
+
+    function: str
+    arguments: dict
+
+
+CONTROL_DECODER = msgspec.json.Decoder(ControlMessage)
+UI_EVENT_ENCODER = msgspec.json.Encoder()
+
+
 @app.get("/")
 async def root():
     return {"status": "ok", "message": "RepoRecon backend is running"}
@@ -55,7 +189,8 @@ async def root():
 @app.websocket("/ws")
 async def websocket_gemini(websocket: WebSocket):
     await websocket.accept()
-    print(f"[WS] Client connected: {websocket.client}")
+    tune_socket_for_audio(client_transport(websocket), "client")
+    log.info("[WS] Client connected: %s", websocket.client)
 
     session_shutdown_reason = "not established"
 
@@ -63,248 +198,350 @@ async def websocket_gemini(websocket: WebSocket):
         async with client.aio.live.connect(
             model=GEMINI_MODEL, config=LIVE_CONFIG
         ) as session:
-            print("[WS] Gemini Live session opened! Ready for voice.")
+            tune_socket_for_audio(gemini_transport(session), "Gemini")
+            log.info("[WS] Gemini Live session opened! Ready for voice.")
 
-            shutdown_reason = "unknown"
-            shutdown_lock = asyncio.Lock()
-            receive_task = None
-            send_task = None
-
-            async def initiate_shutdown(reason: str, *, error: Exception | None = None):
-                nonlocal shutdown_reason, session_shutdown_reason
-                async with shutdown_lock:
-                    if shutdown_reason != "unknown":
-                        return
-                    shutdown_reason = reason
-                    session_shutdown_reason = reason
-                    if error is not None:
-                        print(f"[WS] Shutdown initiated by {reason}: {error}")
-                    else:
-                        print(f"[WS] Shutdown initiated by {reason}")
-
-                    sibling_tasks = [task for task in (receive_task, send_task) if task is not None]
-                    for task in sibling_tasks:
-                        if task is not asyncio.current_task() and not task.done():
-                            task.cancel()
+            audio_queue = asyncio.Queue(maxsize=AUDIO_QUEUE_MAXSIZE)
+            tool_call_queue = asyncio.Queue()
 
             async def receive_from_client():
                 turn_open = False
+                pending_audio = bytearray()
+
+                receive = websocket.receive
+                send_to_gemini = session.send
+
+                async def flush_audio():
+                    if not pending_audio:
+                        return
+                    data = bytes(pending_audio)
+                    pending_audio.clear()
+                    await send_to_gemini(
+                        # Gemini Live works best with 16kHz for low latency
+                        input={"data": data, "mime_type": "audio/pcm;rate=24000"},
+                        end_of_turn=False,
+                    )
 
                 async def finalize_turn(source: str):
                     nonlocal turn_open
                     if not turn_open:
-                        print(f"[TURN] Ignoring end-turn from {source}; no active utterance")
+                        log.info("[TURN] Ignoring end-turn from %s; no active utterance", source)
                         return
 
-                    print(f"[TURN] Finalizing utterance from {source} (end_of_turn=True)")
+                    await flush_audio()
+                    log.info("[TURN] Finalizing utterance from %s (end_of_turn=True)", source)
                     await session.send(end_of_turn=True)
                     turn_open = False
 
                 try:
                     while True:
-                        message = await websocket.receive()
+                        if pending_audio:
+                            try:
+                                message = await asyncio.wait_for(receive(), INBOUND_AUDIO_IDLE_FLUSH_SECONDS)
+                            except TimeoutError:
+                                await flush_audio()
+                                continue
+                        else:
+                            message = await receive()
+
+                        # Audio is the hot path (~75 frames/s), so check for PCM before any other dispatch
+                        data = message.get("bytes")
+                        if data is not None:
+                            if not turn_open:
+                                turn_open = True
+                                log.info("[TURN] New utterance started (first audio chunk)")
+
+                            pending_audio += data
+                            if len(pending_audio) >= INBOUND_AUDIO_FLUSH_BYTES:
+                                await flush_audio()
+                            continue
+
                         message_type = message.get("type")
 
                         if message_type == "websocket.disconnect":
                             await finalize_turn("client websocket close event")
-                            await initiate_shutdown("client websocket close")
                             break
 
                         if message_type != "websocket.receive":
-                            print(f"[WS] Ignoring unsupported websocket event type: {message_type}")
+                            log.warning("[WS] Ignoring unsupported websocket event type: %s", message_type)
                             continue
 
-                        data = message.get("bytes")
                         text = message.get("text")
-
-                        if data is not None:
-                            if not turn_open:
-                                turn_open = True
-                                print("[TURN] New utterance started (first audio chunk)")
-
-                            await session.send(
-                                # Gemini Live works best with 16kHz for low latency
-                                input={"data": data, "mime_type": "audio/pcm;rate=24000"},
-                                end_of_turn=False,
-                            )
-                            continue
-
                         if text is None:
-                            print("[WS] Received empty websocket frame; ignoring")
+                            log.warning("[WS] Received empty websocket frame; ignoring")
                             continue
 
                         try:
-                            payload = json.loads(text)
-                        except json.JSONDecodeError:
-                            print(f"[WS] Ignoring non-JSON text frame: {text[:120]}")
+                            control = CONTROL_DECODER.decode(text)
+                        except msgspec.DecodeError:
+                            log.warning("[WS] Ignoring malformed control frame: %s", text[:120])
                             continue
 
-                        if payload.get("type") == "end_turn":
+                        if control.type == "end_turn":
                             await finalize_turn("client control message")
                         else:
-                            print(f"[WS] Ignoring unknown control payload: {payload}")
+                            log.warning("[WS] Ignoring unknown control payload: %s", text[:120])
                 except WebSocketDisconnect:
                     await finalize_turn("client disconnect")
-                    await initiate_shutdown("client websocket close")
                 except asyncio.CancelledError:
                     raise
                 except Exception as e:
-                    await initiate_shutdown("client receive fatal error", error=e)
+                    raise SessionShutdown("client receive fatal error") from e
+                raise SessionShutdown("client websocket close")
 
             async def send_to_client():
+                def queue_audio(chunk):
+                    if audio_queue.full():
+                        audio_queue.get_nowait()
+                        log.warning("[AudioDrop] dropped=1 reason=queue_full")
+                    audio_queue.put_nowait(chunk)
+
+                def handle_server_content(server_content):
+                    # Transcriptions ride on server_content, usually in messages without a model_turn
+                    input_transcription = server_content.input_transcription
+                    if input_transcription is not None and input_transcription.text:
+                        log.info("[GeminiEvent] input_transcription=%s", input_transcription.text)
+
+                    output_transcription = server_content.output_transcription
+                    if output_transcription is not None and output_transcription.text:
+                        log.info("[GeminiEvent] output_transcription=%s", output_transcription.text)
+
+                    model_turn = server_content.model_turn
+                    if model_turn is None:
+                        return
+
+                    audio_parts = []
+                    for part in model_turn.parts:
+                        if part.text:
+                            log.info("[GeminiEvent] text_part=%s", part.text)
+
+                        function_call = part.function_call
+                        if function_call is not None:
+                            log.info(
+                                "[ToolEvent] kind=part_function_call name=%s id=%s args=%s",
+                                function_call.name,
+                                function_call.id,
+                                function_call.args,
+                            )
+
+                        function_response = part.function_response
+                        if function_response is not None:
+                            log.info(
+                                "[ToolEvent] kind=part_function_response name=%s response=%s",
+                                function_response.name,
+                                function_response.response,
+                            )
+
+                        inline_data = part.inline_data
+                        if inline_data and inline_data.data:
+                            audio_parts.append(inline_data.data)
+
+                    # One queue entry per turn message; the common single-part case is passed through uncopied
+                    if audio_parts:
+                        audio = audio_parts[0] if len(audio_parts) == 1 else b"".join(audio_parts)
+                        log.debug("[Gemini→WS] Speaking... %d bytes", len(audio))
+                        queue_audio(audio)
+
+                # Keyed by LiveServerMessage field
+                message_handlers = {
+                    "server_content": handle_server_content,
+                    "tool_call_cancellation": lambda cancel: log.info("[ToolEvent] kind=cancel ids=%s", cancel.ids or []),
+                    "go_away": lambda go_away: log.info("[ControlEvent] go_away=%s", go_away),
+                    "session_resumption_update": lambda update: log.info("[ControlEvent] session_resumption_update=%s", update),
+                    "usage_metadata": lambda usage: log.info("[GeminiEvent] usage_metadata=%s", usage),
+                }
+                get_handler = message_handlers.get
+
                 try:
                     async for response in session.receive():
-                        response_fields = []
-                        if getattr(response, "server_content", None) is not None:
-                            response_fields.append("server_content")
-                        if getattr(response, "tool_call", None) is not None:
-                            response_fields.append("tool_call")
-                        if getattr(response, "tool_call_cancellation", None) is not None:
-                            response_fields.append("tool_call_cancellation")
-                        if getattr(response, "go_away", None) is not None:
-                            response_fields.append("go_away")
-                        if getattr(response, "session_resumption_update", None) is not None:
-                            response_fields.append("session_resumption_update")
-                        if getattr(response, "input_transcription", None) is not None:
-                            response_fields.append("input_transcription")
-                        if getattr(response, "output_transcription", None) is not None:
-                            response_fields.append("output_transcription")
-                        if getattr(response, "usage_metadata", None) is not None:
-                            response_fields.append("usage_metadata")
-
-                        print(
-                            f"[GeminiEvent] message_type={type(response).__name__} "
-                            f"fields={response_fields or ['<none>']}"
-                        )
-
-                        tool_call = getattr(response, "tool_call", None)
-                        if tool_call is not None:
-                            calls = getattr(tool_call, "function_calls", None) or []
-                            function_responses = []
-                            for call in calls:
-                                name = getattr(call, "name", "<unknown>")
-                                call_id = getattr(call, "id", "<none>")
-                                args = getattr(call, "args", {})
-                                print(
-                                    "[ToolEvent] "
-                                    f"kind=request name={name} "
-                                    f"id={call_id} "
-                                    f"args={args}"
-                                )
-                                
-                                ui_event = {
-                                    "type": "tool_execution",
-                                    "function": name,
-                                    "arguments": args
-                                }
-                                await websocket.send_text(json.dumps(ui_event))
-
-                                # Execute the tool
-                                if name in AVAILABLE_TOOLS:
-                                    func = AVAILABLE_TOOLS[name]
-                                    try:
-                                        # Use asyncio.to_thread to run standard functions async
-                                        result = await asyncio.to_thread(func, **args)
-                                        function_responses.append(types.FunctionResponse(
-                                            name=name,
-                                            id=call_id,
-                                            response={"result": result}
-                                        ))
-                                    except Exception as e:
-                                        print(f"[ToolError] Exception in {name}: {e}")
-                                        function_responses.append(types.FunctionResponse(
-                                            name=name,
-                                            id=call_id,
-                                            response={"error": str(e)}
-                                        ))
-                                else:
-                                    print(f"[ToolError] Unknown tool requested: {name}")
-                                    function_responses.append(types.FunctionResponse(
-                                        name=name,
-                                        id=call_id,
-                                        response={"error": f"Unknown tool: {name}"}
-                                    ))
-
-                            if function_responses:
-                                print(f"[ToolEvent] Sending {len(function_responses)} tool responses back to Gemini")
-                                await session.send_tool_response(function_responses=function_responses)
-
-                        tool_cancel = getattr(response, "tool_call_cancellation", None)
-                        if tool_cancel is not None:
-                            print(
-                                "[ToolEvent] "
-                                f"kind=cancel ids={getattr(tool_cancel, 'ids', [])}"
+                        # Only the keys Gemini actually sent (usually one), instead of probing every field
+                        fields = response.model_fields_set
+
+                        if log.isEnabledFor(logging.DEBUG):
+                            log.debug(
+                                "[GeminiEvent] message_type=%s fields=%s",
+                                type(response).__name__,
+                                sorted(field for field in fields if getattr(response, field) is not None) or ["<none>"],
                             )
 
-                        input_tx = getattr(response, "input_transcription", None)
-                        if input_tx is not None and getattr(input_tx, "text", None):
-                            print(f"[GeminiEvent] input_transcription={input_tx.text}")
-
-                        output_tx = getattr(response, "output_transcription", None)
-                        if output_tx is not None and getattr(output_tx, "text", None):
-                            print(f"[GeminiEvent] output_transcription={output_tx.text}")
-
-                        go_away = getattr(response, "go_away", None)
-                        if go_away is not None:
-                            print(f"[ControlEvent] go_away={go_away}")
-
-                        session_resume = getattr(response, "session_resumption_update", None)
-                        if session_resume is not None:
-                            print(f"[ControlEvent] session_resumption_update={session_resume}")
-
-                        usage_metadata = getattr(response, "usage_metadata", None)
-                        if usage_metadata is not None:
-                            print(f"[GeminiEvent] usage_metadata={usage_metadata}")
-
-                        server_content = getattr(response, "server_content", None)
-                        if server_content is not None:
-                            model_turn = server_content.model_turn
-                            if model_turn is not None:
-                                for part in model_turn.parts:
-                                    if getattr(part, "text", None):
-                                        print(f"[GeminiEvent] text_part={part.text}")
-
-                                    function_call = getattr(part, "function_call", None)
-                                    if function_call is not None:
-                                        print(
-                                            "[ToolEvent] "
-                                            f"kind=part_function_call name={getattr(function_call, 'name', '<unknown>')} "
-                                            f"id={getattr(function_call, 'id', '<none>')} "
-                                            f"args={getattr(function_call, 'args', {})}"
-                                        )
-
-                                    function_response = getattr(part, "function_response", None)
-                                    if function_response is not None:
-                                        print(
-                                            "[ToolEvent] "
-                                            f"kind=part_function_response name={getattr(function_response, 'name', '<unknown>')} "
-                                            f"response={getattr(function_response, 'response', {})}"
-                                        )
-
-                                    if part.inline_data and part.inline_data.data:
-                                        audio_bytes = part.inline_data.data
-                                        # print(f"[Gemini→WS] Speaking...") # Uncomment to see audio packets
-                                        await websocket.send_bytes(audio_bytes)
-                    await initiate_shutdown("Gemini stream close")
+                        # Tools take hundreds of milliseconds; hand them off so audio keeps flowing meanwhile
+                        if "tool_call" in fields and response.tool_call is not None:
+                            tool_call_queue.put_nowait(response.tool_call)
+
+                        for field in fields:
+                            handler = get_handler(field)
+                            if handler is not None:
+                                value = getattr(response, field)
+                                if value is not None:
+                                    handler(value)
                 except asyncio.CancelledError:
                     raise
                 except Exception as e:
-                    await initiate_shutdown("Gemini API fatal error", error=e)
+                    raise SessionShutdown("Gemini API fatal error") from e
+                raise SessionShutdown("Gemini stream close")
+
+            async def execute_tool_calls():
+                send_text = websocket.send_text
+                send_tool_response = session.send_tool_response
+                get_tool = AVAILABLE_TOOLS.get
+
+                async def run_tool(name, call_id, args):
+                    # Responses are built with model_construct: name and id come from Gemini's own call
+                    # and the payload is our dict, so validation adds nothing.
+                    func = get_tool(name)
+                    if func is None:
+                        log.error("[ToolError] Unknown tool requested: %s", name)
+                        return types.FunctionResponse.model_construct(
+                            name=name,
+                            id=call_id,
+                            response={"error": f"Unknown tool: {name}"}
+                        )
 
-            receive_task = asyncio.create_task(receive_from_client(), name="receive_from_client")
-            send_task = asyncio.create_task(send_to_client(), name="send_to_client")
+                    try:
+                        # Plain ** binding: cheaper than any Python-level unpacker, rejects unexpected
+                        # arguments, and it runs on the tool thread anyway
+                        result = await asyncio.get_running_loop().run_in_executor(
+                            TOOL_EXECUTOR, functools.partial(func, **args)
+                        )
+                        return types.FunctionResponse.model_construct(
+                            name=name,
+                            id=call_id,
+                            response={"result": result}
+                        )
+                    except Exception as e:
+                        log.error("[ToolError] Exception in %s: %s", name, e)
+                        return types.FunctionResponse.model_construct(
+                            name=name,
+                            id=call_id,
+                            response={"error": str(e)}
+                        )
+
+                async def handle_tool_call(tool_call):
+                    calls = tool_call.function_calls or []
+                    pending = []
+                    for call in calls:
+                        name = call.name
+                        call_id = call.id
+                        args = call.args or {}
+                        log.info("[ToolEvent] kind=request name=%s id=%s args=%s", name, call_id, args)
+
+                        ui_event = ToolExecutionEvent(function=name, arguments=args)
+                        # Stays a text frame: the frontend treats every binary frame as PCM audio
+                        await send_text(UI_EVENT_ENCODER.encode(ui_event).decode())
+                        pending.append((name, call_id, args))
 
-            await asyncio.gather(receive_task, send_task, return_exceptions=True)
+                    # Parallel calls in one turn run side by side on TOOL_EXECUTOR and go back to Gemini
+                    # as a single response; run_tool reports failures in-band, so gather never raises for them.
+                    function_responses = await asyncio.gather(*(run_tool(*call) for call in pending))
 
-            if shutdown_reason == "unknown":
-                shutdown_reason = "internal task completion"
-                session_shutdown_reason = shutdown_reason
-                print("[WS] Shutdown reason unresolved; tasks ended unexpectedly")
+                    if function_responses:
+                        log.info("[ToolEvent] Sending %d tool responses back to Gemini", len(function_responses))
+                        await send_tool_response(function_responses=function_responses)
 
+                try:
+                    while True:
+                        await handle_tool_call(await tool_call_queue.get())
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    raise SessionShutdown("tool worker fatal error") from e
+
+            async def write_audio_to_client():
+                # Skip send_bytes' per-call dict; the server reads the message before send returns, so one is reused
+                send = websocket.send
+                frame_message = {"type": "websocket.send", "bytes": None}
+                transport = client_transport(websocket)
+                carry = deque()
+                # A single writer has at most one frame in flight, so one reusable buffer is the whole pool
+                frame_view = memoryview(bytearray(AUDIO_BATCH_MAX_BYTES)) if AUDIO_BUFFER_POOL else None
+                try:
+                    while True:
+                        if not carry:
+                            carry.append(await audio_queue.get())
+
+                        # Gemini streams faster than real time, so a queue alone is normal; only trim
+                        # when the transport still holds unsent bytes, i.e. the client is really behind
+                        if audio_queue.qsize() and transport is not None and transport.get_write_buffer_size():
+                            while True:
+                                try:
+                                    carry.append(audio_queue.get_nowait())
+                                except asyncio.QueueEmpty:
+                                    break
+                            backlog = sum(map(len, carry))
+                            dropped = 0
+                            while backlog > AUDIO_HIGH_WATERMARK_BYTES and len(carry) > 1:
+                                backlog -= len(carry.popleft())
+                                dropped += 1
+                            if dropped:
+                                log.warning("[AudioDrop] dropped=%d reason=client_behind", dropped)
+
+                        chunks = [carry.popleft()]
+                        size = len(chunks[0])
+
+                        # Coalesce whatever is already waiting; never wait for more
+                        while size < AUDIO_BATCH_MAX_BYTES:
+                            if not carry:
+                                try:
+                                    carry.append(audio_queue.get_nowait())
+                                except asyncio.QueueEmpty:
+                                    break
+                            if size + len(carry[0]) > AUDIO_BATCH_MAX_BYTES:
+                                break
+                            chunk = carry.popleft()
+                            chunks.append(chunk)
+                            size += len(chunk)
+
+                        if len(chunks) == 1:
+                            # Blob.data is always immutable bytes (the SDK coerces it), so it goes out uncopied
+                            frame = chunks[0]
+                        elif frame_view is not None:
+                            # The ASGI server serializes the frame before send returns, so the buffer is free to reuse
+                            offset = 0
+                            for chunk in chunks:
+                                frame_view[offset:offset + len(chunk)] = chunk
+                                offset += len(chunk)
+                            frame = frame_view[:offset]
+                        else:
+                            frame = b"".join(chunks)
+
+                        frame_message["bytes"] = frame
+                        await send(frame_message)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    raise SessionShutdown("client send fatal error") from e
+
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(receive_from_client(), name="receive_from_client")
+                    tg.create_task(send_to_client(), name="send_to_client")
+                    tg.create_task(execute_tool_calls(), name="execute_tool_calls")
+                    tg.create_task(write_audio_to_client(), name="write_audio_to_client")
+            except* SessionShutdown as shutdowns:
+                # The first task to stop decides the reason; the rest were cancelled because of it
+                shutdown = shutdowns.exceptions[0]
+                session_shutdown_reason = shutdown.reason
+                if shutdown.__cause__ is not None:
+                    log.info("[WS] Shutdown initiated by %s: %s", shutdown.reason, shutdown.__cause__)
+                else:
+                    log.info("[WS] Shutdown initiated by %s", shutdown.reason)
 
     except WebSocketDisconnect:
-        print(f"[WS] Client disconnected: {websocket.client}")
+        log.info("[WS] Client disconnected: %s", websocket.client)
     except Exception as e:
-        print(f"[WS] Session error: {e}")
+        log.error("[WS] Session error: %s", e)
     finally:
-        print(f"[WS] Gemini Live session closed (reason: {session_shutdown_reason})")
+        log.info("[WS] Gemini Live session closed (reason: %s)", session_shutdown_reason)
+
+
+if __name__ == "__main__":
+    # uvloop (no Windows build) and httptools cut per-await and handshake overhead on the audio path
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        # PCM doesn't compress; deflate would only add CPU and latency to every audio frame
+        ws_per_message_deflate=False,
+    )
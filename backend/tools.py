@@ -1,46 +1,122 @@
+import logging
 import os
-from github import Github
+import re
+import threading
 
+import httpx
+from cachetools import LRUCache, TTLCache, cached
+
+# Gemini tends to repeat the same lookup within a session; serve repeats from memory for a couple of minutes.
+# Tools run on a thread pool, hence the locks. Failures raise, so they are never cached.
+SCOUT_CACHE = TTLCache(maxsize=256, ttl=120)
+ANALYSIS_CACHE = TTLCache(maxsize=256, ttl=120)
+
+log = logging.getLogger("reporecon.tools")
+
+GITHUB_API_URL = "https://api.github.com"
+
+# One pooled client for the process keeps the TCP/TLS connection to GitHub warm between tool calls.
+# httpx.Client is safe to share across the tool threads. The token is still read per call because
+# this module is imported before main.py loads .env.
+GITHUB_CLIENT = httpx.Client(
+    base_url=GITHUB_API_URL,
+    headers={"Accept": "application/vnd.github+json"},
+    timeout=10.0,
+)
+
+# repo_name comes from the model and is spliced into an authenticated URL path, so it must be exactly
+# owner/name: no dot segments, query or fragment that could retarget the request (e.g. ../user).
+REPO_NAME_PATTERN = re.compile(r"[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+")
+
+# The issues endpoint lists pull requests alongside issues, so pages are followed until enough real
+# issues turn up. The cap bounds a scan of a repo whose open items are nearly all pull requests.
+SCOUT_TARGET_COUNT = 3
+ISSUES_PER_PAGE = 10
+MAX_ISSUE_PAGES = 5
+
+# repo_name -> (ETag, summary). Outlives SCOUT_CACHE so an expired entry can be revalidated with
+# If-None-Match: GitHub answers 304 with no body and does not charge it against the rate limit.
+# Bounded because repo names come from the model; even a lookup reorders an LRU, hence the lock.
+ETAG_CACHE = LRUCache(maxsize=1024)
+ETAG_CACHE_LOCK = threading.Lock()
+
+@cached(SCOUT_CACHE, key=lambda repo_name: repo_name, lock=threading.Lock())
 def scout_github_issues(repo_name: str) -> str:
     """
     Fetches the latest open issues from a GitHub repository.
     Call this when the user asks to scan a repo for bugs, targets, or issues.
     """
-    print(f"\n[TOOL EXECUTION] 🕵️‍♂️ Gemini triggered scout_github_issues for: {repo_name}...\n")
+    log.info("[TOOL EXECUTION] 🕵️‍♂️ Gemini triggered scout_github_issues for: %s...", repo_name)
     
     token = os.getenv("GITHUB_TOKEN")
-    g = Github(token)
+    headers = {}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    with ETAG_CACHE_LOCK:
+        cached_etag = ETAG_CACHE.get(repo_name)
+    if cached_etag is not None:
+        headers["If-None-Match"] = cached_etag[0]
     
     try:
-        repo = g.get_repo(repo_name)
-        # Fetch the most recent open issues (ignoring labels) to guarantee we find something for the demo
-        issues = repo.get_issues(state='open', sort='created', direction='desc')
+        if not REPO_NAME_PATTERN.fullmatch(repo_name) or any(part in (".", "..") for part in repo_name.split("/")):
+            raise ValueError(f"Invalid repository name {repo_name!r}; expected 'owner/name'")
         
-        result_lines = [f"Tactical scan complete for {repo_name}. Here are the top 3 open targets:"]
-        count = 0
+        # Each REST page carries number, title and pull_request for every item, so nothing is fetched lazily
+        response = GITHUB_CLIENT.get(
+            f"/repos/{repo_name}/issues",
+            params={"state": "open", "sort": "created", "direction": "desc", "per_page": ISSUES_PER_PAGE},
+            headers=headers,
+        )
+        if response.status_code == 304:
+            log.info("[TOOL RESULT] Issues for %s unchanged since last scan.", repo_name)
+            return cached_etag[1]
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        headers.pop("If-None-Match", None)
         
-        for issue in issues:
+        issues = []
+        pages = 1
+        while True:
             # We only want actual issues, not Pull Requests
-            if not issue.pull_request:
-                result_lines.append(f"Target {count + 1}: Issue #{issue.number} - {issue.title}")
-                count += 1
-            if count >= 3:
+            issues.extend(issue for issue in response.json() if "pull_request" not in issue)
+            next_url = response.links.get("next", {}).get("url")
+            if len(issues) >= SCOUT_TARGET_COUNT or next_url is None or pages >= MAX_ISSUE_PAGES:
                 break
-                
+            # A later page answers for the result, so the first page's ETag no longer vouches for it
+            etag = None
+            response = GITHUB_CLIENT.get(next_url, headers=headers)
+            response.raise_for_status()
+            pages += 1
+        
+        issues = issues[:SCOUT_TARGET_COUNT]
+        count = len(issues)
+        
         if count == 0:
-            result = f"No open issues found in {repo_name}."
-            print(f"[TOOL RESULT] {result}")
-            return result
-            
-        final_summary = "\n".join(result_lines)
-        print(f"[TOOL RESULT] Successfully fetched {count} issues.")
+            final_summary = f"No open issues found in {repo_name}."
+            log.info("[TOOL RESULT] %s", final_summary)
+        else:
+            header = f"Tactical scan complete for {repo_name}. Here are the top 3 open targets:"
+            targets = (
+                f"Target {i}: Issue #{issue['number']} - {issue['title']}"
+                for i, issue in enumerate(issues, start=1)
+            )
+            final_summary = "\n".join((header, *targets))
+            log.info("[TOOL RESULT] Successfully fetched %d issues.", count)
+        
+        with ETAG_CACHE_LOCK:
+            if etag:
+                ETAG_CACHE[repo_name] = (etag, final_summary)
+            else:
+                ETAG_CACHE.pop(repo_name, None)
         return final_summary
         
     except Exception as e:
         error_msg = f"Recon failed. I could not access {repo_name}. Error details: {str(e)}"
-        print(f"[TOOL ERROR] {error_msg}")
-        return error_msg
+        log.error("[TOOL ERROR] %s", error_msg)
+        # Raise rather than return so the failure is reported as a tool error and not cached
+        raise RuntimeError(error_msg) from e
 
+@cached(ANALYSIS_CACHE, key=lambda repo_name, issue_number: (repo_name, issue_number), lock=threading.Lock())
 def analyze_issue_code(repo_name: str, issue_number: int) -> str:
     """
     Fetch the specific details of a GitHub issue and provide a plan of attack.
@@ -49,5 +125,5 @@ def analyze_issue_code(repo_name: str, issue_number: int) -> str:
         repo_name: The full name of the repository on GitHub.
         issue_number: The number of the issue to analyze.
     """
-    print(f"\n[TOOL EXECUTION] 🛠️ Gemini triggered analyze_issue_code for {repo_name} #{issue_number}...\n")
+    log.info("[TOOL EXECUTION] 🛠️ Gemini triggered analyze_issue_code for %s #%s...", repo_name, issue_number)
     return f"Fetched issue details for {repo_name} #{issue_number}. The bug appears to be in the routing module. Here is a mocked plan of attack..."
\ No newline at end of file